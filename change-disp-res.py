@@ -4,11 +4,14 @@ Module for changing the display resolution on Windows.
 """
 
 import ctypes
+import functools
+import sys
 
 DM_PELSWIDTH = 0x00080000
 DM_PELSHEIGHT = 0x00100000
 DISP_CHANGE_SUCCESSFUL = 0
-CDS_TEST = 0x00000002
+DISP_CHANGE_BADMODE = -2
+MONITOR_DEFAULTTONULL = 0x00000000
 
 
 class DEVMODE(ctypes.Structure):  # pylint: disable=too-few-public-methods
@@ -40,6 +43,9 @@ class DEVMODE(ctypes.Structure):  # pylint: disable=too-few-public-methods
     ]
 
 
+_DEVMODE_SIZE = ctypes.sizeof(DEVMODE)
+
+
 class DISPLAY_DEVICE(ctypes.Structure):  # pylint: disable=too-few-public-methods
     """Windows DISPLAY_DEVICE structure for display enumeration."""
 
@@ -53,19 +59,116 @@ class DISPLAY_DEVICE(ctypes.Structure):  # pylint: disable=too-few-public-method
     ]
 
 
+_DISPLAY_DEVICE_SIZE = ctypes.sizeof(DISPLAY_DEVICE)
+
+
+class POINT(ctypes.Structure):  # pylint: disable=too-few-public-methods
+    """Windows POINT structure."""
+
+    _fields_ = [("x", ctypes.c_long), ("y", ctypes.c_long)]
+
+
+class RECT(ctypes.Structure):  # pylint: disable=too-few-public-methods
+    """Windows RECT structure."""
+
+    _fields_ = [
+        ("left", ctypes.c_long),
+        ("top", ctypes.c_long),
+        ("right", ctypes.c_long),
+        ("bottom", ctypes.c_long),
+    ]
+
+
+class MONITORINFOEX(ctypes.Structure):  # pylint: disable=too-few-public-methods
+    """Windows MONITORINFOEXW structure for monitor queries."""
+
+    _fields_ = [
+        ("cbSize", ctypes.c_ulong),
+        ("rcMonitor", RECT),
+        ("rcWork", RECT),
+        ("dwFlags", ctypes.c_ulong),
+        ("szDevice", ctypes.c_wchar * 32),
+    ]
+
+
+_MONITORINFOEX_SIZE = ctypes.sizeof(MONITORINFOEX)
+
+
+# Declare the signatures once so ctypes does not infer argument types per call.
+# Guarded so the module can still be imported (e.g. by linters) off Windows.
+if sys.platform == "win32":
+    user32 = ctypes.WinDLL("user32", use_last_error=True)
+
+    user32.EnumDisplayDevicesW.argtypes = [
+        ctypes.c_wchar_p,
+        ctypes.c_ulong,
+        ctypes.POINTER(DISPLAY_DEVICE),
+        ctypes.c_ulong,
+    ]
+    user32.EnumDisplayDevicesW.restype = ctypes.c_int
+
+    user32.EnumDisplaySettingsW.argtypes = [
+        ctypes.c_wchar_p,
+        ctypes.c_ulong,
+        ctypes.POINTER(DEVMODE),
+    ]
+    user32.EnumDisplaySettingsW.restype = ctypes.c_int
+
+    user32.ChangeDisplaySettingsExW.argtypes = [
+        ctypes.c_wchar_p,
+        ctypes.POINTER(DEVMODE),
+        ctypes.c_void_p,
+        ctypes.c_ulong,
+        ctypes.c_void_p,
+    ]
+    user32.ChangeDisplaySettingsExW.restype = ctypes.c_long
+
+    user32.GetCursorPos.argtypes = [ctypes.POINTER(POINT)]
+    user32.GetCursorPos.restype = ctypes.c_int
+
+    user32.MonitorFromPoint.argtypes = [POINT, ctypes.c_ulong]
+    user32.MonitorFromPoint.restype = ctypes.c_void_p
+
+    user32.GetMonitorInfoW.argtypes = [ctypes.c_void_p, ctypes.POINTER(MONITORINFOEX)]
+    user32.GetMonitorInfoW.restype = ctypes.c_int
+
+    user32.SetProcessDPIAware.argtypes = []
+    user32.SetProcessDPIAware.restype = ctypes.c_int
+
+    try:
+        # SetProcessDpiAwareness returns an HRESULT, so last-error is not used
+        shcore = ctypes.WinDLL("shcore")
+        shcore.SetProcessDpiAwareness.argtypes = [ctypes.c_int]
+        shcore.SetProcessDpiAwareness.restype = ctypes.c_long
+    except (OSError, AttributeError):
+        # shcore.dll is unavailable before Windows 8.1
+        shcore = None
+
+
+@functools.cache
+def _enable_dpi_awareness() -> None:
+    """Make the process per-monitor DPI aware; only the first call does work."""
+    # PROCESS_PER_MONITOR_DPI_AWARE = 2
+    if shcore is not None:
+        shcore.SetProcessDpiAwareness(2)
+    else:
+        user32.SetProcessDPIAware()
+
+
 def list_displays() -> list[str]:
     """Enumerate and print all active display devices.
 
     Returns:
         A list of active display device names.
     """
-    user32 = ctypes.windll.user32
     devices = []
     index = 0
 
+    # EnumDisplayDevicesW overwrites the whole structure, so one buffer is reused
+    display = DISPLAY_DEVICE()
+    display.cb = _DISPLAY_DEVICE_SIZE  # pylint: disable=attribute-defined-outside-init
+
     while True:
-        display = DISPLAY_DEVICE()
-        display.cb = ctypes.sizeof(DISPLAY_DEVICE)  # pylint: disable=attribute-defined-outside-init
         if not user32.EnumDisplayDevicesW(None, index, ctypes.byref(display), 0):
             break
         # DISPLAY_DEVICE_ACTIVE = 0x00000001
@@ -86,29 +189,24 @@ def get_display_at_cursor(display_device_names: list[str]) -> str | None:
     Returns:
         The device name of the display under the cursor, or None if not found.
     """
-    user32 = ctypes.windll.user32
-    ctypes.windll.shcore.SetProcessDpiAwareness(2)
+    _enable_dpi_awareness()
 
     # Get cursor position
-    class POINT(ctypes.Structure):  # pylint: disable=too-few-public-methods
-        """Windows POINT structure."""
-
-        _fields_ = [("x", ctypes.c_long), ("y", ctypes.c_long)]
-
     cursor = POINT()
     user32.GetCursorPos(ctypes.byref(cursor))
 
-    # Check which display contains the cursor
-    for device_name in display_device_names:
-        devmode = DEVMODE()
-        devmode.dmSize = ctypes.sizeof(DEVMODE)  # pylint: disable=attribute-defined-outside-init
-        if user32.EnumDisplaySettingsW(device_name, -1, ctypes.byref(devmode)):
-            left = devmode.dmPositionX
-            top = devmode.dmPositionY
-            right = left + devmode.dmPelsWidth
-            bottom = top + devmode.dmPelsHeight
-            if left <= cursor.x < right and top <= cursor.y < bottom:
-                return device_name
+    # Ask Windows directly which monitor contains the cursor
+    hmonitor = user32.MonitorFromPoint(cursor, MONITOR_DEFAULTTONULL)
+    if not hmonitor:
+        return None
+
+    info = MONITORINFOEX()
+    info.cbSize = _MONITORINFOEX_SIZE  # pylint: disable=attribute-defined-outside-init
+    if not user32.GetMonitorInfoW(hmonitor, ctypes.byref(info)):
+        return None
+
+    if info.szDevice in display_device_names:
+        return info.szDevice
 
     return None
 
@@ -126,10 +224,8 @@ def change_resolution(width: int, height: int, device_name: str | None = None) -
         True if the resolution was changed successfully, False otherwise.
     """
 
-    user32 = ctypes.windll.user32
-
     devmode = DEVMODE()
-    devmode.dmSize = ctypes.sizeof(DEVMODE)  # pylint: disable=attribute-defined-outside-init
+    devmode.dmSize = _DEVMODE_SIZE  # pylint: disable=attribute-defined-outside-init
 
     # Enumerate current display settings for the specified device
     if not user32.EnumDisplaySettingsW(device_name, -1, ctypes.byref(devmode)):
@@ -140,15 +236,7 @@ def change_resolution(width: int, height: int, device_name: str | None = None) -
     devmode.dmPelsHeight = height  # pylint: disable=attribute-defined-outside-init
     devmode.dmFields = DM_PELSWIDTH | DM_PELSHEIGHT  # pylint: disable=attribute-defined-outside-init
 
-    # Test if the resolution is supported on the specified device
-    result = user32.ChangeDisplaySettingsExW(
-        device_name, ctypes.byref(devmode), None, CDS_TEST, None
-    )
-    if result != DISP_CHANGE_SUCCESSFUL:
-        print(f"Error: Resolution {width}x{height} is not supported.")
-        return False
-
-    # Apply the resolution change to the specified device
+    # Apply the resolution change; an unsupported mode is rejected without changes
     result = user32.ChangeDisplaySettingsExW(
         device_name, ctypes.byref(devmode), None, 0, None
     )
@@ -156,6 +244,10 @@ def change_resolution(width: int, height: int, device_name: str | None = None) -
         print(f"Resolution changed to {width}x{height} successfully.")
         return True
 
+    if result == DISP_CHANGE_BADMODE:
+        print(f"Error: Resolution {width}x{height} is not supported.")
+        return False
+
     print(f"Error: Failed to change resolution. Error code: {result}")
     return False
 
@@ -2,6 +2,7 @@
 """Play a video using the python-vlc library."""
 
 import sys
+import threading
 
 import vlc
 
@@ -19,13 +20,18 @@ def play_video(video_path: str, device_name: str = r"\\.\DISPLAY1") -> None:
     media = instance.media_new(video_path)
     player.set_media(media)
     player.set_fullscreen(True)
-    player.play()
 
-    # Wait until playback finishes
-    while True:
-        state = player.get_state()
-        if state in (vlc.State.Ended, vlc.State.Error):
-            break
+    # Block until VLC reports that playback has finished
+    done = threading.Event()
+    events = player.event_manager()
+    events.event_attach(vlc.EventType.MediaPlayerEndReached, lambda _: done.set())
+    events.event_attach(vlc.EventType.MediaPlayerEncounteredError, lambda _: done.set())
+    events.event_attach(vlc.EventType.MediaPlayerStopped, lambda _: done.set())
+
+    player.play()
+    # Wake up periodically so Ctrl+C is still handled on Windows
+    while not done.wait(0.5):
+        pass
 
 
 if __name__ == "__main__":